@@ -17,4 +17,6 @@
 #    along with this program. If not, see <https://www.gnu.org/licenses/gpl-3.0.html>.
 #
 
-# todo
\ No newline at end of file
+set -e
+
+python -m pytest tests
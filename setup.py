@@ -41,13 +41,26 @@ install_requires = [
         "urllib3==2.7.0",
         "requests==2.33.0",
         "pandas==2.2.2",
+        "numpy==1.26.4",
+        "shapely==2.0.6",
         "plotly==6.0.1",
         "scipy==1.13.1",
         "datetime==5.5"
 ]
 
+dask_require = [
+    'dask[distributed]>=2024.1.0',
+]
+
+tests_require = [
+    'pytest>=7.0',
+    'geopandas>=1.0',
+] + dask_require
+
 extras_require = {
     'docs': docs_require,
+    'dask': dask_require,
+    'tests': tests_require,
 }
 
 extras_require['all'] = [ req for exts, reqs in extras_require.items() for req in reqs ]
@@ -65,6 +78,6 @@ setup(
     install_requires=install_requires,
     long_description = LONG_DESCRIPTION,
     setup_requires=['pytest-runner'],
-    tests_require=['pytest==4.4.1'],
+    tests_require=tests_require,
     test_suite='tests',
 )
@@ -0,0 +1,136 @@
+#
+#    This file is part of Python Client Library for WCPMS.
+#    Copyright (C) 2025 INPE.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <https://www.gnu.org/licenses/gpl-3.0.html>.
+#
+
+
+"""Unit-test for the cube query and its local validation."""
+
+from unittest import mock
+
+import pytest
+
+from wcpms import CubeQuery, clear_collections_cache, cube_query, validate_cube
+from wcpms import wcpms
+
+QUERY = dict(collection='S2-16D-2', start_date='2021-01-01', end_date='2021-12-31', freq='16D', band='NDVI')
+
+METADATA = {'S2-16D-2': dict(bands=['NDVI', 'EVI'], freq='16D', bbox=[-75, -35, -30, 6])}
+
+
+@pytest.fixture
+def collections():
+    clear_collections_cache()
+    with mock.patch.object(wcpms, 'get_collections', return_value=['S2-16D-2', 'mod13q1-6.1']) as get_collections:
+        yield get_collections
+    clear_collections_cache()
+
+
+def test_cube_query_returns_dict():
+    assert cube_query(**QUERY) == QUERY
+
+
+def test_cube_query_mapping():
+    query = CubeQuery(**QUERY)
+
+    assert query['band'] == 'NDVI'
+    assert 'band' in query and 'geom' not in query
+    assert list(query) == list(QUERY)
+    assert dict(query) == QUERY
+    assert query.get('geom') is None
+    assert query.to_dict() == QUERY
+    with pytest.raises(KeyError):
+        query['geom']
+
+
+def test_cube_query_hashable():
+    assert hash(CubeQuery(**QUERY)) == hash(CubeQuery.from_dict(QUERY))
+    assert CubeQuery.from_dict(QUERY) == CubeQuery(**QUERY)
+    assert len({CubeQuery(**QUERY), CubeQuery(**dict(QUERY, band='EVI'))}) == 2
+
+
+def test_cube_query_immutable():
+    with pytest.raises(AttributeError):
+        CubeQuery(**QUERY).band = 'EVI'
+
+
+@pytest.mark.parametrize('changes', [
+    dict(start_date='2021-1-1'),
+    dict(start_date='2021-02-30'),
+    dict(end_date='31/12/2021'),
+    dict(start_date='2022-01-01'),
+    dict(freq='16'),
+    dict(freq='D16'),
+    dict(band=''),
+    dict(collection=None),
+])
+def test_cube_query_invalid(changes):
+    with pytest.raises(ValueError):
+        CubeQuery(**dict(QUERY, **changes))
+    with pytest.raises(ValueError):
+        cube_query(**dict(QUERY, **changes))
+
+
+def test_cube_query_from_dict_missing():
+    with pytest.raises(ValueError, match='freq, band'):
+        CubeQuery.from_dict(dict(collection='S2-16D-2', start_date='2021-01-01', end_date='2021-12-31'))
+
+
+def test_validate_cube(collections):
+    query = validate_cube('url', QUERY, latitude=-29.2, longitude=-55.9, metadata=METADATA)
+
+    assert query == CubeQuery(**QUERY)
+
+
+def test_validate_cube_without_metadata(collections):
+    assert validate_cube('url', dict(QUERY, band='anything', freq='8D'), latitude=50, longitude=50) == \
+        CubeQuery(**dict(QUERY, band='anything', freq='8D'))
+
+
+@pytest.mark.parametrize('changes, location', [
+    (dict(collection='S2-16D-3'), {}),
+    (dict(band='RED'), {}),
+    (dict(freq='8D'), {}),
+    ({}, dict(latitude=40.0, longitude=-55.9)),
+    ({}, dict(latitude=-29.2)),
+    ({}, dict(longitude=-55.9)),
+    ({}, dict(latitude=-95, longitude=-55.9)),
+    ({}, dict(latitude=-29.2, longitude=190)),
+])
+def test_validate_cube_invalid(collections, changes, location):
+    with pytest.raises(ValueError):
+        validate_cube('url', dict(QUERY, **changes), metadata=METADATA, **location)
+
+
+def test_validate_cube_caches_collections(collections):
+    for _ in range(3):
+        validate_cube('url', QUERY)
+    validate_cube('other-url', QUERY)
+
+    assert collections.call_count == 2
+
+
+def test_clear_collections_cache(collections):
+    validate_cube('url', QUERY)
+    collections.return_value = ['S2-16D-2', 'S2-16D-3']
+
+    with pytest.raises(ValueError):
+        validate_cube('url', dict(QUERY, collection='S2-16D-3'))
+
+    clear_collections_cache()
+
+    assert validate_cube('url', dict(QUERY, collection='S2-16D-3')).collection == 'S2-16D-3'
+    assert collections.call_count == 2
@@ -0,0 +1,198 @@
+#
+#    This file is part of Python Client Library for WCPMS.
+#    Copyright (C) 2025 INPE.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <https://www.gnu.org/licenses/gpl-3.0.html>.
+#
+
+"""Unit-test for the tiled region processing and its executors, against a stub WCPMS server."""
+
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import box, shape
+
+from wcpms import CubeQuery, DaskExecutor, get_phenometrics_features, get_phenometrics_tiles
+from wcpms.wcpms import _tiles
+
+#: Pixel centers of the stub data cube, at odd multiples of 1/16 degree.
+#: All the values below are exact binary fractions, so the tile borders of
+#: 5/16 degree fall exactly on pixel centers.
+PIXELS = np.arange(-15, 48, 2) / 16
+
+TILE_SIZE = 5 / 16
+
+#: An L-shaped region, whose edges lie between pixel centers.
+REGION = {
+    'type': 'Polygon',
+    'coordinates': [[[0, 0], [1.5, 0], [1.5, 0.5], [0.5, 0.5], [0.5, 1.5], [0, 1.5], [0, 0]]]
+}
+
+CUBE = CubeQuery('S2-16D-2', '2021-01-01', '2021-12-31', '16D', 'NDVI')
+
+
+def _expected():
+    x, y = np.meshgrid(PIXELS, PIXELS)
+    x, y = x.ravel(), y.ravel()
+    inside = ((x > 0) & (x < 1.5) & (y > 0) & (y < 0.5)) | ((x > 0) & (x < 0.5) & (y > 0) & (y < 1.5))
+    return sorted(zip(x[inside], y[inside]))
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+
+        if self.path == '/timeseries':
+            self.server.geoms.append(body['geom'])
+            geom = body['geom']
+            # Pixel centers on the border are returned too, as for both of the tiles sharing it.
+            x, y = np.meshgrid(PIXELS, PIXELS)
+            inside = shapely.intersects_xy(shape(geom), x.ravel(), y.ravel())
+            result = [
+                dict(point=[px, py], timeline=['2021-01-01', '2021-01-17'], timeseries=[0.2, 0.8])
+                for px, py in zip(x.ravel()[inside], y.ravel()[inside])
+            ]
+        else:
+            result = [
+                dict(ts, phenometrics=dict(sos_v=ts['point'][0], pos_v=ts['point'][1], sos_t='2021-01-17T00:00:00'))
+                for ts in body['timeseries']
+            ]
+
+        data = json.dumps(dict(result=result)).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.geoms = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def url(server):
+    server.geoms.clear()
+    return 'http://127.0.0.1:%d' % server.server_address[1]
+
+
+def _check_pixels(frame):
+    pixels = list(zip(frame['longitude'], frame['latitude']))
+    assert len(pixels) == len(set(pixels))
+    assert sorted(pixels) == _expected()
+    assert (frame['sos_v'] == frame['longitude']).all()
+
+
+def test_tiles_skip_outside_region():
+    tiles = _tiles(REGION, TILE_SIZE)
+
+    # 5 x 5 tiles cover the bounding box; the 3 x 3 block at the inner corner of the L misses it.
+    assert len(tiles) == 16
+    for geom, (west, south, east, north), _, _ in tiles:
+        tile = shape(geom)
+        assert tile.is_valid
+        assert box(west, south, east, north).buffer(1e-12).contains(tile)
+    assert sum(shape(tile[0]).area for tile in tiles) == pytest.approx(shape(REGION).area)
+
+
+def test_tiles_concave_region():
+    u_shape = {'type': 'Polygon', 'coordinates': [[[0, 0], [3, 0], [3, 6], [2, 6], [2, 2], [1, 2], [1, 6], [0, 6], [0, 0]]]}
+
+    (bottom, *_), (top, *_) = _tiles(u_shape, 3)
+
+    assert shape(bottom).is_valid and shape(top).is_valid
+    assert shape(bottom).geom_type == 'Polygon' and shape(bottom).area == pytest.approx(8)
+    # The arms of the U are separate polygons, not one self-overlapping ring.
+    assert shape(top).geom_type == 'MultiPolygon' and len(shape(top).geoms) == 2
+    assert shape(top).area == pytest.approx(6)
+
+
+def test_tiles_not_polygon():
+    with pytest.raises(ValueError):
+        _tiles({'type': 'Point', 'coordinates': [0, 0]}, 0.1)
+
+
+def test_tiles_without_slivers():
+    square = {'type': 'Polygon', 'coordinates': [[[1, 0], [1.3, 0], [1.3, 0.1], [1, 0.1], [1, 0]]]}
+
+    bounds = [tile[1] for tile in _tiles(square, 0.1)]
+
+    assert len(bounds) == 3
+    assert all(west < east and south < north for west, south, east, north in bounds)
+
+
+def test_tiles_empty_region(url):
+    line = {'type': 'Polygon', 'coordinates': [[[1, 0], [1, 1], [1, 0]]]}
+
+    frame = get_phenometrics_tiles(url, CUBE, line)
+
+    assert len(frame) == 0
+
+
+def test_thread_pool(url, server):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        frame = get_phenometrics_tiles(url, CUBE, REGION, tile_size=TILE_SIZE, executor=executor)
+
+    _check_pixels(frame)
+    assert len(server.geoms) == 16
+
+
+def test_default_executor(url):
+    _check_pixels(get_phenometrics_tiles(url, CUBE, REGION, tile_size=TILE_SIZE, batch_size=7))
+
+
+def test_process_pool(url):
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        frame = get_phenometrics_tiles(url, CUBE, REGION, tile_size=TILE_SIZE, executor=executor)
+
+    _check_pixels(frame)
+
+
+def test_dask_local_cluster(url):
+    distributed = pytest.importorskip('distributed')
+
+    with distributed.LocalCluster(n_workers=2, processes=False, dashboard_address=None) as cluster, \
+            distributed.Client(cluster) as client:
+        frame = get_phenometrics_tiles(url, CUBE, REGION, tile_size=TILE_SIZE, executor=DaskExecutor(client))
+
+    _check_pixels(frame)
+
+
+def test_features_process_pool(url):
+    gdf = pytest.importorskip('geopandas').GeoDataFrame(
+        {'id': ['a', 'b']},
+        geometry=[pytest.importorskip('shapely.geometry').shape(REGION), None]
+    )
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        result = get_phenometrics_features(url, CUBE, gdf, id_column='id', executor=executor)
+
+    assert result['b'] is None
+    assert all('phenometrics' in pm for pm in result['a'])
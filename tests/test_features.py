@@ -0,0 +1,145 @@
+#
+#    This file is part of Python Client Library for WCPMS.
+#    Copyright (C) 2025 INPE.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <https://www.gnu.org/licenses/gpl-3.0.html>.
+#
+
+
+"""Unit-test for the concurrent processing of GeoDataFrame features."""
+
+from unittest import mock
+
+import pytest
+
+gpd = pytest.importorskip('geopandas')
+from shapely.geometry import box
+
+from wcpms import gdf_to_geojson, get_phenometrics_features, get_timeseries_features
+from wcpms import wcpms
+
+CUBE = dict(collection='S2-16D-2', start_date='2021-01-01', end_date='2021-12-31', freq='16D', band='NDVI')
+
+
+def _timeseries_region(url, cube, geom):
+    west = min(x for x, y in geom['coordinates'][0])
+    if west < 0:
+        raise RuntimeError(f'failed at {west}')
+    return [dict(point=[west, 0], timeline=['2021-01-01'], timeseries=[0.5])]
+
+
+@pytest.fixture
+def region():
+    with mock.patch.object(wcpms, 'get_timeseries_region', side_effect=_timeseries_region) as timeseries_region:
+        yield timeseries_region
+
+
+def test_index_ids(region):
+    gdf = gpd.GeoDataFrame(geometry=[box(1, 0, 2, 1), box(2, 0, 3, 1)], index=[10, 20])
+
+    result = get_timeseries_features('url', CUBE, gdf)
+
+    assert list(result) == [10, 20]
+    assert result[20][0]['point'] == [2, 0]
+
+
+def test_column_ids(region):
+    gdf = gpd.GeoDataFrame({'id': ['b', 'a']}, geometry=[box(1, 0, 2, 1), box(2, 0, 3, 1)])
+
+    result = get_timeseries_features('url', CUBE, gdf, id_column='id', max_workers=1)
+
+    assert result['b'][0]['point'] == [1, 0]
+    assert result['a'][0]['point'] == [2, 0]
+
+
+def test_geoseries(region):
+    result = get_timeseries_features('url', CUBE, gpd.GeoSeries([box(1, 0, 2, 1)]))
+
+    assert result[0][0]['point'] == [1, 0]
+
+
+def test_duplicated_ids(region):
+    gdf = gpd.GeoDataFrame({'id': [1, 1]}, geometry=[box(1, 0, 2, 1), box(2, 0, 3, 1)])
+
+    with pytest.raises(ValueError, match='unique'):
+        get_timeseries_features('url', CUBE, gdf, id_column='id')
+    with pytest.raises(ValueError, match='unique'):
+        get_timeseries_features('url', CUBE, gdf.set_index('id'))
+    region.assert_not_called()
+
+
+def test_null_geometry(region):
+    gdf = gpd.GeoDataFrame({'id': [1, 2]}, geometry=[None, box(1, 0, 2, 1)])
+
+    result = get_timeseries_features('url', CUBE, gdf, id_column='id')
+
+    assert result[1] is None
+    assert region.call_count == 1
+
+
+def test_errors_collect(region):
+    gdf = gpd.GeoDataFrame({'id': [1, 2, 3]}, geometry=[box(1, 0, 2, 1), box(-1, 0, 0, 1), None])
+
+    result = get_timeseries_features('url', CUBE, gdf, id_column='id', errors='collect')
+
+    assert result[1][0]['point'] == [1, 0]
+    assert isinstance(result[2], RuntimeError)
+    assert result[3] is None
+
+
+def test_errors_raise_fails_fast():
+    calls = []
+
+    def timeseries_region(url, cube, geom):
+        calls.append(geom)
+        if len(calls) == 1:
+            raise RuntimeError('service down')
+        return []
+
+    gdf = gpd.GeoDataFrame(geometry=[box(i, 0, i + 1, 1) for i in range(50)])
+    with mock.patch.object(wcpms, 'get_timeseries_region', side_effect=timeseries_region):
+        with pytest.raises(RuntimeError, match='service down'):
+            get_timeseries_features('url', CUBE, gdf, max_workers=1)
+
+    assert len(calls) < 50
+
+
+def test_errors_invalid(region):
+    with pytest.raises(ValueError):
+        get_timeseries_features('url', CUBE, gpd.GeoSeries([box(1, 0, 2, 1)]), errors='ignore')
+
+
+def test_phenometrics_features(region):
+    gdf = gpd.GeoDataFrame({'id': ['a']}, geometry=[box(1, 0, 2, 1)])
+
+    with mock.patch.object(wcpms, 'get_phenometrics_region', side_effect=lambda url, cube, timeseries: timeseries):
+        result = get_phenometrics_features('url', CUBE, gdf, id_column='id')
+
+    assert result['a'][0]['point'] == [1, 0]
+
+
+def test_gdf_to_geojson():
+    gdf = gpd.GeoDataFrame(geometry=[box(1, 0, 2, 1), box(2, 0, 3, 1)])
+
+    assert gdf_to_geojson(gdf)['type'] == 'Polygon'
+    assert gdf_to_geojson(gdf.geometry) == gdf_to_geojson(gdf)
+
+
+def test_gdf_to_geojson_null_geometry():
+    assert gdf_to_geojson(gpd.GeoDataFrame(geometry=[None])) is None
+
+
+def test_gdf_to_geojson_empty():
+    with pytest.raises(ValueError):
+        gdf_to_geojson(gpd.GeoDataFrame(geometry=[]))
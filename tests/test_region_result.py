@@ -0,0 +1,140 @@
+#
+#    This file is part of Python Client Library for WCPMS.
+#    Copyright (C) 2025 INPE.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <https://www.gnu.org/licenses/gpl-3.0.html>.
+#
+
+"""Unit-test for the spatial index of the region results."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from wcpms import RegionResult
+
+
+def _region(points):
+    return RegionResult([
+        {'point': [x, y], 'phenometrics': {'sos_v': x, 'pos_v': y, 'sos_t': '2021-01-02T00:00:00'}}
+        for x, y in points
+    ])
+
+
+def _square(west, south, east, north):
+    return {
+        'type': 'Polygon',
+        'coordinates': [[[west, south], [east, south], [east, north], [west, north], [west, south]]]
+    }
+
+
+def test_nearest_far_query():
+    region = RegionResult([{'point': [4.54, 9.52]}, {'point': [8.21, 5.91]}])
+
+    assert region.nearest(1.8, 0.76)['point'] == [8.21, 5.91]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_nearest_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 10, (int(rng.integers(1, 300)), 2))
+    region = _region(points)
+
+    for query in rng.uniform(-5, 15, (300, 2)):
+        found = np.array(region.nearest(*query)['point'])
+        distance = ((points - query) ** 2).sum(axis=1)
+        assert np.isclose(((found - query) ** 2).sum(), distance.min())
+
+
+def test_bbox_brute_force():
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0, 1, (5000, 2))
+    region = _region(points)
+
+    for west, south in rng.uniform(-0.1, 1, (100, 2)):
+        east, north = west + rng.uniform(0, 0.3), south + rng.uniform(0, 0.3)
+        found = [tuple(r['point']) for r in region.bbox(west, south, east, north)]
+        inside = (points[:, 0] >= west) & (points[:, 0] <= east) & (points[:, 1] >= south) & (points[:, 1] <= north)
+        assert found == [tuple(p) for p in points[inside]]
+
+
+def test_within_polygon_with_hole():
+    xs, ys = np.meshgrid(np.arange(10) + 0.5, np.arange(10) + 0.5)
+    region = _region(np.column_stack([xs.ravel(), ys.ravel()]))
+    polygon = _square(0, 0, 4, 4)
+    polygon['coordinates'].append(_square(1, 1, 2, 2)['coordinates'][0])
+
+    assert len(region.within(polygon)) == 15
+    assert len(region.within({'type': 'MultiPolygon', 'coordinates': [polygon['coordinates'], _square(6, 6, 8, 8)['coordinates']]})) == 19
+
+
+def test_zonal_stats():
+    xs, ys = np.meshgrid(np.arange(10) + 0.5, np.arange(10) + 0.5)
+    region = _region(np.column_stack([xs.ravel(), ys.ravel()]))
+    fields = pd.Series([_square(0, 0, 2, 2), _square(20, 20, 21, 21)], index=['a', 'b'])
+
+    table = region.zonal_stats(fields, metrics=['sos_v', 'sos_t'])
+
+    assert table.loc['a', ('sos_v', 'mean')] == 1.0
+    assert table.loc['a', ('sos_t', 'median')] == pd.Timestamp('2021-01-02')
+    assert table['pixels'].tolist() == [4, 0]
+
+
+def test_zonal_stats_empty_region():
+    table = RegionResult([]).zonal_stats(pd.Series([_square(0, 0, 1, 1)], index=['a']))
+
+    assert table['pixels'].tolist() == [0]
+
+
+def test_nearest_empty_region():
+    with pytest.raises(ValueError):
+        RegionResult([]).nearest(0, 0)
+
+
+def test_grid_of_almost_a_line():
+    rng = np.random.default_rng(0)
+    points = np.column_stack([np.linspace(0, 10, 500), rng.uniform(0, 1e-13, 500)])
+    region = _region(points)
+
+    assert region._nx * region._ny <= len(points)
+    assert len(region.bbox(2, -1, 4, 1)) == int(((points[:, 0] >= 2) & (points[:, 0] <= 4)).sum())
+    assert region.nearest(5.01, 3)['point'][0] == pytest.approx(points[np.argmin(abs(points[:, 0] - 5.01)), 0])
+
+
+@pytest.mark.parametrize('points', [[[1.0, 1.0]], [[1.0, 1.0], [1.0, 1.0]], [[0.0, 0.0], [0.0, 5.0]]])
+def test_degenerate_regions(points):
+    region = _region(points)
+
+    assert region.nearest(0.2, 0.2)['point'] == points[0]
+    assert len(region.bbox(-10, -10, 10, 10)) == len(points)
+
+
+def test_infinite_bbox():
+    points = np.random.default_rng(1).uniform(0, 1, (100, 2))
+    region = _region(points)
+
+    assert len(region.bbox(-np.inf, -np.inf, np.inf, np.inf)) == 100
+    assert len(region.bbox(0.5, -np.inf, np.inf, np.inf)) == int((points[:, 0] >= 0.5).sum())
+    assert len(region.nearest(1e300, -1e300)) > 0
+
+
+@pytest.mark.parametrize('longitude, latitude', [(np.nan, 0), (0, np.nan), (np.inf, 0)])
+def test_nearest_not_finite(longitude, latitude):
+    with pytest.raises(ValueError):
+        _region([[0.0, 0.0]]).nearest(longitude, latitude)
+
+
+def test_bbox_nan():
+    with pytest.raises(ValueError):
+        _region([[0.0, 0.0]]).bbox(np.nan, 0, 1, 1)
@@ -0,0 +1,118 @@
+#
+#    This file is part of Python Client Library for WCPMS.
+#    Copyright (C) 2025 INPE.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <https://www.gnu.org/licenses/gpl-3.0.html>.
+#
+
+
+"""Unit-test for the compact result types."""
+
+import json
+from datetime import datetime
+
+import numpy as np
+
+from wcpms import Phenometrics, TimeSeries, parse_result
+
+METRICS = {
+    'sos_t': '2021-01-02T00:00:00', 'sos_v': 7649.0,
+    'pos_t': '2021-03-07T00:00:00', 'pos_v': 8123.5,
+    'eos_t': '2021-07-13T00:00:00', 'eos_v': None,
+    'aos_v': 2975.66650390625,
+}
+
+POINT_RESULT = {
+    'phenometrics': METRICS,
+    'timeseries': {'timeline': ['2021-01-01', '2021-01-17', '2021-02-02'], 'values': [0.2, None, 0.8]},
+}
+
+REGION_RESULT = {
+    'point': [-55.95, -29.2],
+    'phenometrics': METRICS,
+    'timeline': ['2021-01-01T00:00:00', '2021-01-17T00:00:00'],
+    'timeseries': [None, 2.5],
+}
+
+
+def test_phenometrics_round_trip():
+    phenometrics = Phenometrics.from_dict(METRICS)
+
+    assert phenometrics.sos_t == datetime(2021, 1, 2)
+    assert phenometrics.eos_v is None
+    assert phenometrics.to_dict() == METRICS
+
+
+def test_phenometrics_missing_and_none():
+    assert 'eos_v' in Phenometrics.from_dict({'eos_v': None}).to_dict()
+    assert Phenometrics.from_dict({}).to_dict() == {}
+    assert Phenometrics.from_dict({'eos_v': None}) != Phenometrics.from_dict({})
+
+
+def test_phenometrics_constructor():
+    phenometrics = Phenometrics(sos_v=1.0, sos_t=datetime(2021, 1, 2))
+
+    assert phenometrics.to_dict() == {'sos_v': 1.0, 'sos_t': '2021-01-02T00:00:00'}
+    assert phenometrics == Phenometrics.from_dict(phenometrics.to_dict())
+
+
+def test_phenometrics_extra():
+    phenometrics = Phenometrics.from_dict(dict(METRICS, lag=[1, 2]))
+
+    assert phenometrics.extra == (('lag', [1, 2]),)
+    assert phenometrics.to_dict() == dict(METRICS, lag=[1, 2])
+
+
+def test_phenometrics_hash_and_eq():
+    first = Phenometrics.from_dict(dict(METRICS, lag=[1, 2]))
+    second = Phenometrics.from_dict(dict(METRICS, lag=[1, 2]))
+    other = Phenometrics.from_dict(dict(METRICS, lag=[3]))
+
+    assert first == second and hash(first) == hash(second)
+    assert first != other and hash(first) == hash(other)
+    assert len({first, second, other}) == 2
+
+
+def test_timeseries_values_form():
+    timeseries = TimeSeries.from_dict(POINT_RESULT['timeseries'])
+
+    assert timeseries.timeline.dtype == np.dtype('datetime64[D]')
+    assert np.isnan(timeseries.values[1])
+    assert timeseries.point is None
+    assert timeseries.to_dict() == POINT_RESULT['timeseries']
+
+
+def test_timeseries_region_form():
+    timeseries = TimeSeries.from_dict(REGION_RESULT)
+    result = timeseries.to_dict()
+
+    assert timeseries.point == (-55.95, -29.2)
+    assert result == {key: REGION_RESULT[key] for key in ('point', 'timeline', 'timeseries')}
+    assert json.loads(json.dumps(result, allow_nan=False)) == result
+
+
+def test_parse_result_point():
+    phenometrics, timeseries = parse_result(POINT_RESULT)
+
+    assert phenometrics == Phenometrics.from_dict(METRICS)
+    assert timeseries.values_key == 'values'
+    assert timeseries.to_dict() == POINT_RESULT['timeseries']
+
+
+def test_parse_result_region():
+    phenometrics, timeseries = parse_result(REGION_RESULT)
+
+    assert phenometrics.to_dict() == METRICS
+    assert timeseries.values_key == 'timeseries'
+    assert timeseries.point == (-55.95, -29.2)
@@ -0,0 +1,110 @@
+#
+#    This file is part of Python Client Library for WCPMS.
+#    Copyright (C) 2025 INPE.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program. If not, see <https://www.gnu.org/licenses/gpl-3.0.html>.
+#
+
+"""Unit-test for the client-side season slicing."""
+
+from unittest import mock
+
+import pytest
+
+from wcpms import cube_query, get_phenometrics_seasons, season_windows, slice_seasons, slice_timeseries
+from wcpms import wcpms
+
+TIMESERIES = [
+    dict(point=[-55.9, -29.2], timeline=['2021-08-29', '2021-09-14', '2022-04-23', '2022-05-09'], timeseries=[1, 2, 3, 4]),
+    dict(point=[-55.8, -29.2], timeline=['2021-08-29T00:00:00', '2021-09-14T00:00:00'], timeseries=[5, None]),
+]
+
+CUBE = cube_query(collection='S2-16D-2', start_date='2021-01-01', end_date='2023-12-31', freq='16D', band='NDVI')
+
+
+def test_season_windows_calendar_year():
+    assert season_windows(2021, 2022) == [('2021-01-01', '2021-12-31'), ('2022-01-01', '2022-12-31')]
+
+
+def test_season_windows_cross_year():
+    assert season_windows(2021, 2022, '09-01', '04-30') == [('2021-09-01', '2022-04-30'), ('2022-09-01', '2023-04-30')]
+
+
+def test_season_windows_leap_day():
+    assert season_windows(2019, 2020, '12-01', '02-29') == [('2019-12-01', '2020-02-29'), ('2020-12-01', '2021-02-28')]
+
+
+@pytest.mark.parametrize('season_start', ['9-1', '09/01', '13-01', '02-30', None])
+def test_season_windows_invalid(season_start):
+    with pytest.raises(ValueError):
+        season_windows(2021, 2022, season_start=season_start)
+
+
+def test_slice_timeseries():
+    result = slice_timeseries(TIMESERIES[0], '2021-09-01', '2022-04-30')
+
+    assert result == dict(point=[-55.9, -29.2], timeline=['2021-09-14', '2022-04-23'], timeseries=[2, 3])
+    assert TIMESERIES[0]['timeseries'] == [1, 2, 3, 4]
+
+
+def test_slice_timeseries_bounds_are_inclusive():
+    result = slice_timeseries(TIMESERIES[1], '2021-08-29', '2021-09-14')
+
+    assert result['timeline'] == TIMESERIES[1]['timeline']
+    assert result['timeseries'] == [5, None]
+
+
+def test_slice_seasons():
+    result = slice_seasons(TIMESERIES, [('2021-01-01', '2021-08-31'), ('2021-09-01', '2022-04-30')])
+
+    assert [ts['timeseries'] for ts in result[('2021-01-01', '2021-08-31')]] == [[1], [5]]
+    assert [ts['timeseries'] for ts in result[('2021-09-01', '2022-04-30')]] == [[2, 3], [None]]
+
+
+def test_phenometrics_batches():
+    calls = []
+
+    def phenometrics_region(url, cube, timeseries):
+        calls.append(len(timeseries))
+        return [dict(ts, phenometrics={}) for ts in timeseries]
+
+    with mock.patch.object(wcpms, 'get_phenometrics_region', phenometrics_region):
+        result = wcpms._get_phenometrics_batches('url', CUBE, [{}] * 7, batch_size=3)
+
+    assert calls == [3, 3, 1]
+    assert len(result) == 7
+
+
+def test_phenometrics_seasons():
+    cubes = []
+
+    def phenometrics_region(url, cube, timeseries):
+        cubes.append((cube['start_date'], cube['end_date'], len(timeseries)))
+        return timeseries
+
+    seasons = season_windows(2021, 2022, '09-01', '04-30')
+    with mock.patch.object(wcpms, 'get_phenometrics_region', phenometrics_region):
+        result = get_phenometrics_seasons('url', CUBE, TIMESERIES, seasons, batch_size=1)
+
+    assert list(result) == seasons
+    assert cubes == [('2021-09-01', '2022-04-30', 1)] * 2 + [('2022-09-01', '2023-04-30', 1)] * 2
+    assert CUBE['start_date'] == '2021-01-01'
+
+
+def test_phenometrics_seasons_outside_cube():
+    with mock.patch.object(wcpms, 'get_phenometrics_region') as phenometrics_region:
+        with pytest.raises(ValueError):
+            get_phenometrics_seasons('url', CUBE, TIMESERIES, season_windows(2023, 2023, '09-01', '04-30'))
+
+    phenometrics_region.assert_not_called()
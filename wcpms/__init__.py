@@ -18,4 +18,4 @@
 
 """Python Client Library for Web Crop Phenology Metrics Service"""
 
-from .wcpms import WCPMS, cube_query, get_phenometrics, plot_points_region, plot_phenometrics, get_collections, get_description,get_timeseries_region,get_phenometrics_region, gdf_to_geojson, plot_advanced_phenometrics,plot_points_region
\ No newline at end of file
+from .wcpms import WCPMS, BATCH_SIZE, CubeQuery, cube_query, get_phenometrics, plot_points_region, plot_phenometrics, get_collections, get_description,get_timeseries_region,get_phenometrics_region, gdf_to_geojson, plot_advanced_phenometrics,plot_points_region, get_timeseries_point, season_windows, slice_timeseries, slice_seasons, get_phenometrics_seasons, validate_cube, clear_collections_cache, Phenometrics, TimeSeries, parse_result, get_timeseries_features, get_phenometrics_features, RegionResult, DaskExecutor, get_phenometrics_tiles
\ No newline at end of file
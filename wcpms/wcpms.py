@@ -19,16 +19,26 @@
 """Python Client Library for Web Crop Phenology Metrics Service"""
 
 import os
-import json
+import re
 import urllib
 import warnings
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
 import requests
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry import mapping, shape
 import plotly.express as px
-from datetime import timedelta
+import calendar
+from datetime import date, timedelta
 import plotly.graph_objects as go
 from scipy.signal import savgol_filter
 from datetime import datetime as dt
 import plotly.graph_objects as go
+from functools import lru_cache, partial
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields, asdict
+from typing import Optional
 
 warnings.filterwarnings("ignore")
 
@@ -54,6 +64,217 @@ class WCPMS:
         #: str: Authentication token to be used with the WCPMS server.
         self._access_token = access_token
 
+_FREQ_PATTERN = re.compile(r'^[1-9][0-9]*[DWMY]$')
+
+_DATE_PATTERN = re.compile(r'^[0-9]{4}-[0-9]{2}-[0-9]{2}$')
+
+def _parse_date(value, name):
+    try:
+        if not _DATE_PATTERN.match(value):
+            raise ValueError(value)
+        return dt.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f'Cube query {name} must follow the YYYY-MM-DD structure, got {value!r}.') from None
+
+@dataclass(frozen=True, slots=True)
+class CubeQuery(Mapping):
+    """An immutable and hashable data cube query, checked locally when created.
+
+    It is a read-only mapping of the fields (``cube['band']``, ``'band' in cube``,
+    ``dict(cube)``), so it can be used anywhere a ``cube_query`` dictionary is
+    expected, and as a cache key.
+
+    Args:
+        collection (str): The collection id identifier.
+        start_date (str): The begin of a time interval. Following YYYY-MM-DD structure.
+        end_date (str): The end of a time interval. Following YYYY-MM-DD structure.
+        freq (str): The frequency of images of the associated collection. Following (N-days) structure.
+        band (str): The attribute (band) name.
+
+    Raises:
+        ValueError: If any of the fields is malformed.
+    """
+
+    collection: str
+    start_date: str
+    end_date: str
+    freq: str
+    band: str
+
+    def __post_init__(self):
+        for name in _CUBE_FIELDS:
+            value = getattr(self, name)
+            if not isinstance(value, str) or not value:
+                raise ValueError(f'Cube query {name} must be a non-empty string, got {value!r}.')
+
+        start = _parse_date(self.start_date, 'start_date')
+        end = _parse_date(self.end_date, 'end_date')
+        if start > end:
+            raise ValueError(f'Cube query start_date {self.start_date} is after end_date {self.end_date}.')
+
+        if not _FREQ_PATTERN.match(self.freq):
+            raise ValueError(f'Cube query freq must follow the (N-days) structure, e.g. 16D, got {self.freq!r}.')
+
+    def __getitem__(self, key):
+        if key not in _CUBE_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(_CUBE_FIELDS)
+
+    def __len__(self):
+        return len(_CUBE_FIELDS)
+
+    def to_dict(self):
+        """Return the query in the dictionary form of ``cube_query``."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, cube):
+        """Create a query from a ``cube_query`` dictionary.
+
+        Raises:
+            ValueError: If a key is missing or any of the fields is malformed.
+        """
+        if isinstance(cube, cls):
+            return cube
+        missing = [name for name in _CUBE_FIELDS if name not in cube]
+        if missing:
+            raise ValueError(f'Cube query is missing {", ".join(missing)}.')
+        return cls(**{name: cube[name] for name in _CUBE_FIELDS})
+
+_CUBE_FIELDS = tuple(cube_field.name for cube_field in fields(CubeQuery))
+
+PHENOMETRICS = (
+    'pos_v', 'pos_t', 'mos_v', 'vos_v', 'vos_t', 'bse_v', 'aos_v', 'sos_v', 'sos_t',
+    'eos_v', 'eos_t', 'los_v', 'roi_v', 'rod_v', 'lios_v', 'sios_v', 'liot_v', 'siot_v'
+)
+
+@dataclass(frozen=True, slots=True)
+class Phenometrics:
+    """The phenological metrics of a pixel, with times parsed into datetimes.
+
+    Metrics ending in ``_t`` are times and the others are values. Metrics
+    not known by the client are kept in ``extra``, which takes part in equality
+    but not in the hash, so the metrics are hashable whatever extra holds.
+
+    ``present`` holds the names of the metrics given by the service, so that a
+    metric returned as ``None`` is told apart from a missing one. When not given,
+    it holds the metrics that are not ``None``.
+    """
+
+    pos_v: Optional[float] = None
+    pos_t: Optional[dt] = None
+    mos_v: Optional[float] = None
+    vos_v: Optional[float] = None
+    vos_t: Optional[dt] = None
+    bse_v: Optional[float] = None
+    aos_v: Optional[float] = None
+    sos_v: Optional[float] = None
+    sos_t: Optional[dt] = None
+    eos_v: Optional[float] = None
+    eos_t: Optional[dt] = None
+    los_v: Optional[float] = None
+    roi_v: Optional[float] = None
+    rod_v: Optional[float] = None
+    lios_v: Optional[float] = None
+    sios_v: Optional[float] = None
+    liot_v: Optional[float] = None
+    siot_v: Optional[float] = None
+    extra: tuple = field(default=(), hash=False)
+    present: frozenset = None
+
+    def __post_init__(self):
+        if self.present is None:
+            present = frozenset(name for name in PHENOMETRICS if getattr(self, name) is not None)
+            object.__setattr__(self, 'present', present)
+
+    def to_dict(self):
+        """Return the metrics in the dictionary form returned by the service."""
+        result = {}
+        for name in PHENOMETRICS:
+            if name in self.present:
+                value = getattr(self, name)
+                result[name] = value.isoformat() if isinstance(value, dt) else value
+        result.update(self.extra)
+        return result
+
+    @classmethod
+    def from_dict(cls, phenometrics):
+        """Create the metrics from the ``phenometrics`` dictionary returned by the service."""
+        known = {}
+        extra = []
+        for name, value in phenometrics.items():
+            if name not in PHENOMETRICS:
+                extra.append((name, value))
+            elif name.endswith('_t') and isinstance(value, str):
+                known[name] = dt.fromisoformat(value)
+            else:
+                known[name] = value
+        return cls(**known, extra=tuple(extra), present=frozenset(known))
+
+@dataclass(frozen=True, slots=True, eq=False)
+class TimeSeries:
+    """The satellite images time series of a pixel, backed by numpy arrays.
+
+    Args:
+        timeline (numpy.ndarray): The observation dates as ``datetime64``.
+        values (numpy.ndarray): The observation values as ``float64``, missing values as ``NaN``.
+        point (tuple, optional): The pixel center as (longitude, latitude), according to EPSG:4326.
+        values_key (str): The key holding the values in the dictionary form, ``timeseries`` or ``values``.
+    """
+
+    timeline: np.ndarray
+    values: np.ndarray
+    point: tuple = None
+    values_key: str = 'timeseries'
+
+    def to_dict(self):
+        """Return the time series in the dictionary form it was created from, with missing values as ``None``."""
+        values = self.values.astype(object)
+        values[np.isnan(self.values)] = None
+
+        result = {
+            'timeline': np.datetime_as_string(self.timeline).tolist(),
+            self.values_key: values.tolist()
+        }
+        if self.point is not None:
+            result['point'] = list(self.point)
+        return result
+
+    @classmethod
+    def from_dict(cls, timeseries):
+        """Create the time series from a dictionary returned by the service.
+
+        Both the region form (``timeline`` and ``timeseries`` lists) and the
+        ``get_phenometrics`` form (``timeline`` and ``values`` lists) are accepted.
+        """
+        values_key = 'values' if 'values' in timeseries else 'timeseries'
+        point = timeseries.get('point')
+        return cls(
+            timeline=np.array(timeseries['timeline'], dtype='datetime64'),
+            values=np.asarray(timeseries[values_key], dtype=np.float64),
+            point=tuple(point) if point is not None else None,
+            values_key=values_key
+        )
+
+def parse_result(result):
+    """Converts a phenological metrics result from the dictionary form into the compact types.
+
+    Args:
+        result : Dictionary returned by ``get_phenometrics`` or an item of the list returned by ``get_phenometrics_region``.
+
+    Returns:
+    tuple: A (Phenometrics, TimeSeries) tuple.
+    """
+    if isinstance(result['timeseries'], dict):
+        timeseries = TimeSeries.from_dict(result['timeseries'])
+    else:
+        timeseries = TimeSeries.from_dict(result)
+
+    return Phenometrics.from_dict(result['phenometrics']), timeseries
+
 def get_phenometrics(url, cube, latitude, longitude):
     """Returns in dictionary form all the phenological metrics calculated for the given spatial location, as well as the time series and timeline used.
 
@@ -144,17 +365,15 @@ def cube_query(collection, start_date, end_date, freq, band):
 
     
     Raises:
-        ConnectionError: If the server is not reachable.
-        HTTPError: If the server response indicates an error.
-        ValueError: If the response body is not a json document.
+        ValueError: If a date does not follow the YYYY-MM-DD structure, start_date is after end_date or freq is malformed.
     """
-    return dict(
+    return CubeQuery(
         collection = collection,
-        band = band,
         start_date = start_date,
         end_date = end_date,
-        freq=freq
-    )
+        freq=freq,
+        band = band
+    ).to_dict()
 
 def smooth_timeseries(ts, method='savitsky', window_length=3, polyorder=1):
     if (method=='savitsky'):
@@ -397,8 +616,16 @@ def get_description(url):
     return data_json['description']
     
 
+def _geometries(df):
+    # A GeoDataFrame exposes its active geometry column, a GeoSeries is already one.
+    return df.geometry if hasattr(df, 'columns') else df
+
 def gdf_to_geojson(df):
-    return json.loads(df.to_json())["features"][0]['geometry']
+    geoms = _geometries(df)
+    if len(geoms) == 0:
+        raise ValueError('The GeoDataFrame has no features.')
+    geom = next(iter(geoms))
+    return geom.__geo_interface__ if geom is not None else None
 
 def plot_points_region(polygon, phenos):
     x_coords = [p["point"][0] for p in phenos]
@@ -478,3 +705,793 @@ def get_phenometrics_region(url, cube, timeseries):
     data_json = data.json()
 
     return data_json['result']
+
+#: int: Maximum number of time series sent in each request to /phenometrics. This is the
+#: batch used in the ``wcpms-phenometrics-region`` notebook, where larger requests
+#: exceed the 30 seconds request limit of the service.
+BATCH_SIZE = 350
+
+_MONTH_DAY_PATTERN = re.compile(r'^[0-9]{2}-[0-9]{2}$')
+
+def _season_date(year, month_day, name):
+    if not isinstance(month_day, str) or not _MONTH_DAY_PATTERN.match(month_day):
+        raise ValueError(f'{name} must follow the MM-DD structure, got {month_day!r}.')
+
+    month, day = int(month_day[:2]), int(month_day[3:])
+    # A season ending on February 29 ends on February 28 in the common years.
+    if (month, day) == (2, 29) and not calendar.isleap(year):
+        day = 28
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        raise ValueError(f'{name} {month_day!r} is not a valid month and day.') from None
+
+def get_timeseries_point(url, cube, latitude, longitude):
+    """Retrieves the satellite images time series of the pixel center nearest to the given spatial location.
+
+    Args:
+        url: The url of the available wcpms service running.
+
+        cube : Dictionary with information about a BDC's data cubes with collection, start_date, end_date, freq and band.
+
+        longitude : (int/float) A longitude value according to EPSG:4326.
+
+        latitude : (int/float) A latitude value according to EPSG:4326.
+
+    Returns:
+    list: A list with a dictionary holding the satellite images time series of the pixel, in the same form as ``get_timeseries_region``.
+    Its ``point`` is the given location, not the pixel center.
+
+    
+    Raises:
+        ConnectionError: If the server is not reachable.
+        HTTPError: If the server response indicates an error.
+        ValueError: If the response body is not a json document.
+    """
+    # The time series is read from the /phenometrics response, which already
+    # holds it, since /timeseries is only known to accept region geometries.
+    result = get_phenometrics(url=url, cube=cube, latitude=latitude, longitude=longitude)
+
+    return [dict(
+        point=[longitude, latitude],
+        timeline=result['timeseries']['timeline'],
+        timeseries=result['timeseries']['values']
+    )]
+
+def season_windows(start_year, end_year, season_start='01-01', season_end='12-31'):
+    """Build the list of season windows between two years.
+
+    A season whose ``season_end`` comes before ``season_start`` in the calendar
+    (e.g. Southern Hemisphere summer crops, ``'09-01'`` to ``'04-30'``) ends in the
+    year following its start. A ``'02-29'`` bound falls on February 28 in common years.
+
+    Args:
+        start_year : (int) The year in which the first season starts.
+
+        end_year : (int) The year in which the last season starts.
+
+        season_start : String containing the month and day when each season begins. Following MM-DD structure.
+
+        season_end : String containing the month and day when each season ends. Following MM-DD structure.
+
+    Returns:
+    list: A list of (start_date, end_date) tuples following YYYY-MM-DD structure.
+
+
+    Raises:
+        ValueError: If season_start or season_end is not a valid MM-DD month and day.
+
+    Example:
+
+        .. doctest::
+
+            >>> season_windows(2021, 2022, season_start='09-01', season_end='04-30')
+            [('2021-09-01', '2022-04-30'), ('2022-09-01', '2023-04-30')]
+    """
+    # Checked in a leap year, so that the format is validated even without seasons.
+    _season_date(2000, season_start, 'season_start')
+    _season_date(2000, season_end, 'season_end')
+    cross_year = season_end < season_start
+
+    seasons = []
+    for year in range(start_year, end_year + 1):
+        end = year + 1 if cross_year else year
+        seasons.append((_season_date(year, season_start, 'season_start'), _season_date(end, season_end, 'season_end')))
+
+    return seasons
+
+def slice_timeseries(timeseries, start_date, end_date):
+    """Cuts a pixel time series to the observations within the given time interval.
+
+    Args:
+        timeseries : Dictionary with the satellite images time series of a pixel, as returned by ``get_timeseries_region``.
+
+        start_date : String containing the begin of a time interval. Following YYYY-MM-DD structure.
+
+        end_date : String containing the end of a time interval. Following YYYY-MM-DD structure.
+
+    Returns:
+    dictionary: A copy of the given time series holding only the observations between start_date and end_date (inclusive).
+    """
+    timeline = timeseries['timeline']
+    values = timeseries['timeseries']
+
+    # ISO 8601 dates sort lexicographically, so comparing the date part is enough.
+    keep = [i for i, t in enumerate(timeline) if start_date <= t[:10] <= end_date]
+
+    result = dict(timeseries)
+    result['timeline'] = [timeline[i] for i in keep]
+    result['timeseries'] = [values[i] for i in keep]
+
+    return result
+
+def slice_seasons(timeseries, seasons):
+    """Cuts a list of pixel time series into season windows on the client.
+
+    Args:
+        timeseries : JSON containing a list of dictionaries with satellite images time series for each pixel.
+
+        seasons : A list of (start_date, end_date) tuples, e.g. as returned by ``season_windows``.
+
+    Returns:
+    dictionary: A dictionary mapping each (start_date, end_date) tuple to the list of sliced time series.
+    """
+    return {
+        (start_date, end_date): [slice_timeseries(ts, start_date, end_date) for ts in timeseries]
+        for start_date, end_date in seasons
+    }
+
+def _get_phenometrics_batches(url, cube, timeseries, batch_size):
+    phenometrics = []
+    for i in range(0, len(timeseries), batch_size):
+        phenometrics.extend(get_phenometrics_region(
+            url=url,
+            cube=cube,
+            timeseries=timeseries[i:i + batch_size]
+        ))
+    return phenometrics
+
+def get_phenometrics_seasons(url, cube, timeseries, seasons, batch_size=BATCH_SIZE):
+    """List phenological metrics calculated for each pixel and each season of an already retrieved time series.
+
+    The multi-year time series should be fetched only once (using ``get_timeseries_region``
+    or ``get_timeseries_point`` with a cube covering all the seasons). It is sliced into the
+    season windows on the client, and only the slices are submitted to the service, so the
+    satellite images are not read again for every season.
+
+    Args:
+        url: The url of the available wcpms service running.
+
+        cube : Dictionary with information about a BDC's data cubes with collection, start_date, end_date, freq and band.
+
+        timeseries : JSON containing a list of dictionaries with satellite images time series for each pixel.
+
+        seasons : A list of (start_date, end_date) tuples, e.g. as returned by ``season_windows``.
+
+        batch_size : (int) Maximum number of time series sent in each request to the service.
+
+    Returns:
+    dictionary: A dictionary mapping each (start_date, end_date) tuple to the list of phenological metrics calculated for each pixel centers.
+
+    
+    Raises:
+        ConnectionError: If the server is not reachable.
+        HTTPError: If the server response indicates an error.
+        ValueError: If the response body is not a json document or a season is outside of the cube time interval.
+
+    Example:
+
+        Retrieves the phenological metrics of the 2018-2023 summer seasons with a single time series request:
+
+        .. doctest::
+            :skipif: WCPMS_EXAMPLE_URL is None
+
+            >>> from wcpms import *
+            >>> wcpms_url = WCPMS_EXAMPLE_URL
+            >>> datacube = cube_query(
+            ...                       collection="S2-16D-2",
+            ...                       start_date="2018-09-01",
+            ...                       end_date="2024-04-30",
+            ...                       freq='16D',
+            ...                       band="NDVI")
+            >>> ts = get_timeseries_point(
+            ...                  url = wcpms_url,
+            ...                  cube = datacube,
+            ...                  latitude=-29.20, longitude= -55.95)
+            >>> pm = get_phenometrics_seasons(
+            ...                  url = wcpms_url,
+            ...                  cube = datacube,
+            ...                  timeseries = ts,
+            ...                  seasons = season_windows(2018, 2023, '09-01', '04-30'))
+            >>> len(pm)
+            6
+    """
+    for start_date, end_date in seasons:
+        if start_date < cube['start_date'] or end_date > cube['end_date']:
+            raise ValueError(f"Season {start_date} to {end_date} is outside of the cube time interval "
+                             f"{cube['start_date']} to {cube['end_date']}.")
+
+    result = {}
+    for season, season_timeseries in slice_seasons(timeseries, seasons).items():
+        season_cube = dict(cube)
+        season_cube['start_date'], season_cube['end_date'] = season
+
+        result[season] = _get_phenometrics_batches(url, season_cube, season_timeseries, batch_size)
+
+    return result
+
+@lru_cache(maxsize=None)
+def _cached_collections(url):
+    return tuple(get_collections(url))
+
+def clear_collections_cache():
+    """Forget the collections retrieved by ``validate_cube``, so that they are retrieved again on the next check.
+
+    Long-running processes should call it when collections are added to or removed from the service.
+    """
+    _cached_collections.cache_clear()
+
+def validate_cube(url, cube, latitude=None, longitude=None, metadata=None):
+    """Checks a data cube query and spatial location before sending them to the service.
+
+    The list of available collections is retrieved once per url and then reused,
+    so checking each row of a large batch does not cost a network call. It is
+    kept until ``clear_collections_cache`` is called.
+
+    Args:
+        url: The url of the available wcpms service running.
+
+        cube : Dictionary with information about a BDC's data cubes with collection, start_date, end_date, freq and band, or a ``CubeQuery``.
+
+        longitude : (int/float, optional) A longitude value according to EPSG:4326.
+
+        latitude : (int/float, optional) A latitude value according to EPSG:4326.
+
+        metadata : (dict, optional) Dictionary mapping a collection id to its known ``bands`` (list), ``freq`` (str) and ``bbox`` ([west, south, east, north] in EPSG:4326).
+
+    Returns:
+    CubeQuery: The checked data cube query.
+
+
+    Raises:
+        ValueError: If the query is malformed, the collection is not available, the band or freq does not match the collection or the location is outside of its extent.
+        ConnectionError: If the server is not reachable while retrieving the collections.
+
+    Example:
+
+        .. doctest::
+            :skipif: WCPMS_EXAMPLE_URL is None
+
+            >>> from wcpms import *
+            >>> wcpms_url = WCPMS_EXAMPLE_URL
+            >>> datacube = cube_query(
+            ...                       collection="S2-16D-3",
+            ...                       start_date="2021-01-01",
+            ...                       end_date="2021-12-31",
+            ...                       freq='16D',
+            ...                       band="NDVI")
+            >>> validate_cube(wcpms_url, datacube, latitude=-29.20, longitude=-55.95)
+            Traceback (most recent call last):
+            ...
+            ValueError: Collection 'S2-16D-3' is not available in the service.
+    """
+    query = CubeQuery.from_dict(cube)
+
+    if query.collection not in _cached_collections(url):
+        raise ValueError(f'Collection {query.collection!r} is not available in the service.')
+
+    if (latitude is None) != (longitude is None):
+        raise ValueError('Both latitude and longitude must be given.')
+    if latitude is not None and not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError(f'Location ({latitude}, {longitude}) is not a valid EPSG:4326 coordinate.')
+
+    info = (metadata or {}).get(query.collection, {})
+
+    if 'bands' in info and query.band not in info['bands']:
+        raise ValueError(f'Band {query.band!r} is not available in {query.collection}, expected one of {", ".join(info["bands"])}.')
+
+    if 'freq' in info and query.freq != info['freq']:
+        raise ValueError(f'Freq {query.freq!r} does not match {query.collection}, expected {info["freq"]!r}.')
+
+    if 'bbox' in info and latitude is not None:
+        west, south, east, north = info['bbox']
+        if not (west <= longitude <= east and south <= latitude <= north):
+            raise ValueError(f'Location ({latitude}, {longitude}) is outside of {query.collection} extent.')
+
+    return query
+
+def _feature_ids(gdf, id_column):
+    ids = gdf[id_column] if id_column is not None else gdf.index
+    if not ids.is_unique:
+        raise ValueError(f"Feature ids must be unique, {id_column or 'the index'} has duplicated values.")
+    return ids.tolist()
+
+def _skip_null(func, geom):
+    return func(geom) if geom is not None else None
+
+def _capture(func, geom):
+    # Return the error instead of raising it, so that one failing feature does
+    # not discard the results of the others.
+    try:
+        return _skip_null(func, geom)
+    except Exception as error:
+        return error
+
+def _run(executor, task, items):
+    futures = [executor.submit(task, item) for item in items]
+    try:
+        # Waited in completion order, so that the first error is raised at once
+        # and the tasks not started yet are cancelled.
+        for future in as_completed(futures):
+            future.result()
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+    return [future.result() for future in futures]
+
+def _map(task, items, max_workers, executor=None):
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return _run(pool, task, items)
+    if isinstance(executor, Executor):
+        return _run(executor, task, items)
+    return list(executor.map(task, items))
+
+def _map_features(func, gdf, id_column, max_workers, executor=None, errors='raise'):
+    if errors not in ('raise', 'collect'):
+        raise ValueError(f"errors must be 'raise' or 'collect', got {errors!r}.")
+
+    ids = _feature_ids(gdf, id_column)
+    geoms = [geom.__geo_interface__ if geom is not None else None for geom in _geometries(gdf)]
+    task = partial(_capture if errors == 'collect' else _skip_null, func)
+
+    return dict(zip(ids, _map(task, geoms, max_workers, executor)))
+
+# Module level (instead of closures) so that process pools and Dask can pickle them.
+def _feature_timeseries(url, cube, geom):
+    return get_timeseries_region(url=url, cube=cube, geom=geom)
+
+def _feature_phenometrics(url, cube, batch_size, geom):
+    timeseries = get_timeseries_region(url=url, cube=cube, geom=geom)
+    return _get_phenometrics_batches(url, cube, timeseries, batch_size)
+
+def get_timeseries_features(url, cube, gdf, id_column=None, max_workers=4, executor=None, errors='raise'):
+    """Retrieves the satellite images time series of the pixel centers within each feature of a GeoDataFrame, running the features concurrently.
+
+    Args:
+        url: The url of the available wcpms service running.
+
+        cube : Dictionary with information about a BDC's data cubes with collection, start_date, end_date, freq and band.
+
+        gdf : GeoDataFrame (or GeoSeries) with the geometries used to retrieve time series, according to EPSG:4326.
+
+        id_column : (str, optional) Column holding the feature id, which must be unique. The GeoDataFrame index is used when not given.
+
+        max_workers : (int) Maximum number of features requested at the same time.
+
+        executor : (optional) Executor running the features instead of a thread pool of max_workers, e.g. a ``concurrent.futures.ProcessPoolExecutor`` or a ``DaskExecutor``.
+
+        errors : (str) ``'raise'`` to raise the first error at once, cancelling the features not started yet, or ``'collect'`` to map each failing feature id to its exception.
+
+    Returns:
+    dictionary: A dictionary mapping each feature id to the list of dictionaries with satellite images time series for each pixel (``None`` for a feature without geometry).
+
+
+    Raises:
+        ValueError: If the feature ids are not unique.
+        ConnectionError: If the server is not reachable.
+        HTTPError: If the server response indicates an error.
+        ValueError: If the response body is not a json document.
+    """
+    return _map_features(partial(_feature_timeseries, url, cube), gdf, id_column, max_workers, executor, errors)
+
+def get_phenometrics_features(url, cube, gdf, id_column=None, max_workers=4, batch_size=BATCH_SIZE, executor=None, errors='raise'):
+    """List phenological metrics calculated for each pixel centers within each feature of a GeoDataFrame, running the features concurrently.
+
+    Args:
+        url: The url of the available wcpms service running.
+
+        cube : Dictionary with information about a BDC's data cubes with collection, start_date, end_date, freq and band.
+
+        gdf : GeoDataFrame (or GeoSeries) with the geometries used to retrieve time series, according to EPSG:4326.
+
+        id_column : (str, optional) Column holding the feature id, which must be unique. The GeoDataFrame index is used when not given.
+
+        max_workers : (int) Maximum number of features requested at the same time.
+
+        batch_size : (int) Maximum number of time series sent in each request to the service.
+
+        executor : (optional) Executor running the features instead of a thread pool of max_workers, e.g. a ``concurrent.futures.ProcessPoolExecutor`` or a ``DaskExecutor``.
+
+        errors : (str) ``'raise'`` to raise the first error at once, cancelling the features not started yet, or ``'collect'`` to map each failing feature id to its exception.
+
+    Returns:
+    dictionary: A dictionary mapping each feature id to the list of dictionaries with phenological metrics calculated for each pixel centers (``None`` for a feature without geometry).
+
+
+    Raises:
+        ValueError: If the feature ids are not unique.
+        ConnectionError: If the server is not reachable.
+        HTTPError: If the server response indicates an error.
+        ValueError: If the response body is not a json document.
+
+    Example:
+
+        Retrieves the phenological metrics of every field of a GeoPackage:
+
+        .. doctest::
+            :skipif: WCPMS_EXAMPLE_URL is None
+
+            >>> import geopandas as gpd
+            >>> from wcpms import *
+            >>> wcpms_url = WCPMS_EXAMPLE_URL
+            >>> datacube = cube_query(
+            ...                       collection="S2-16D-2",
+            ...                       start_date="2022-01-01",
+            ...                       end_date="2022-12-31",
+            ...                       freq='16D',
+            ...                       band="NDVI")
+            >>> fields = gpd.read_file("LEM_dataset_small.gpkg")
+            >>> pm = get_phenometrics_features(
+            ...                  url = wcpms_url,
+            ...                  cube = datacube,
+            ...                  gdf = fields,
+            ...                  id_column = 'id',
+            ...                  max_workers = 8)
+            >>> len(pm) == len(fields)
+            True
+    """
+    return _map_features(partial(_feature_phenometrics, url, cube, batch_size), gdf, id_column, max_workers, executor, errors)
+
+def _polygon_rings(geom):
+    geom = geom if isinstance(geom, dict) else geom.__geo_interface__
+    if geom['type'] == 'Polygon':
+        return [ring for ring in geom['coordinates']]
+    if geom['type'] == 'MultiPolygon':
+        return [ring for polygon in geom['coordinates'] for ring in polygon]
+    raise ValueError(f"Geometry type {geom['type']} is not supported, expected Polygon or MultiPolygon.")
+
+def _contains(rings, x, y):
+    # Even-odd ray casting, vectorized over the points: holes and the parts of a
+    # multipolygon are handled by toggling the flag for every ring crossed.
+    inside = np.zeros(len(x), dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for ring in rings:
+            ring = np.asarray(ring, dtype=np.float64)
+            xi, yi = ring[:, 0], ring[:, 1]
+            xj, yj = np.roll(xi, 1), np.roll(yi, 1)
+            for k in range(len(ring)):
+                crosses = (yi[k] > y) != (yj[k] > y)
+                inside ^= crosses & (x < (xj[k] - xi[k]) * (y - yi[k]) / (yj[k] - yi[k]) + xi[k])
+    return inside
+
+def _phenometrics_frame(results, x, y):
+    frame = pd.DataFrame({'longitude': x, 'latitude': y})
+    metrics = pd.DataFrame([r.get('phenometrics', {}) for r in results])
+    for name in metrics.columns:
+        column = metrics[name]
+        frame[name] = pd.to_datetime(column) if name.endswith('_t') else pd.to_numeric(column, errors='coerce')
+    return frame
+
+class RegionResult:
+    """A spatially indexed container for the per-pixel results of a region.
+
+    The pixel centers (the ``point`` of each result) are bucketed in a regular
+    grid, so that location, bounding box and polygon queries only look at the
+    pixels of the grid cells they touch. The phenological metrics are also kept
+    as columns of a ``pandas.DataFrame`` for zonal statistics.
+
+    Args:
+        results (list): A list of dictionaries with a ``point`` field, as returned by ``get_phenometrics_region`` or ``get_timeseries_region``.
+
+    Example:
+
+        Summarizes the phenological metrics of a region for each field boundary:
+
+        .. code-block:: python
+
+            region = RegionResult(phenometrics)
+            pixel = region.nearest(longitude=-45.83, latitude=-12.25)
+            table = region.zonal_stats(fields, metrics=['sos_t', 'pos_v'], id_column='id')
+    """
+
+    def __init__(self, results):
+        #: list: The per-pixel results, in the given order.
+        self.results = list(results)
+
+        points = np.array([r['point'] for r in self.results], dtype=np.float64).reshape(-1, 2)
+        self._x = points[:, 0]
+        self._y = points[:, 1]
+
+        #: pandas.DataFrame: The pixel centers and phenological metrics, one row per result.
+        self.data = _phenometrics_frame(self.results, self._x, self._y)
+
+        self._build_grid()
+
+    def _build_grid(self):
+        n = len(self.results)
+        if n == 0:
+            self._x0 = self._y0 = 0.0
+            self._cell = 1.0
+            self._nx = self._ny = 1
+            self._order = self._keys = np.empty(0, dtype=np.int64)
+            return
+
+        self._x0, self._y0 = self._x.min(), self._y.min()
+        width, height = self._x.max() - self._x0, self._y.max() - self._y0
+
+        # About 8 pixels per cell on average. The cell is never smaller than the
+        # longest side split in that many cells, so that a region that is almost
+        # a line does not get a huge grid.
+        cells = max(n / 8, 1)
+        self._cell = max(np.sqrt(width * height / cells), max(width, height) / cells) or 1.0
+
+        self._nx = int(width // self._cell) + 1
+        self._ny = int(height // self._cell) + 1
+        keys = self._cell_x(self._x) * self._ny + self._cell_y(self._y)
+        self._order = np.argsort(keys, kind='stable')
+        self._keys = keys[self._order]
+
+    # The cell indexes are clipped before the cast, so that infinite bounds do not overflow.
+    def _cell_x(self, x):
+        return np.clip(np.floor((np.asarray(x) - self._x0) / self._cell), -1, self._nx).astype(np.int64)
+
+    def _cell_y(self, y):
+        return np.clip(np.floor((np.asarray(y) - self._y0) / self._cell), 0, self._ny - 1).astype(np.int64)
+
+    def _candidates(self, west, south, east, north):
+        if len(self._keys) == 0 or west > east or south > north:
+            return np.empty(0, dtype=np.int64)
+
+        # The cells of a grid column are contiguous in the sorted keys, so each
+        # column touched by the box is a single slice.
+        columns = np.arange(max(self._cell_x(west), 0), min(self._cell_x(east), self._nx - 1) + 1)
+        if len(columns) == 0:
+            return np.empty(0, dtype=np.int64)
+        lo = np.searchsorted(self._keys, columns * self._ny + self._cell_y(south), side='left')
+        hi = np.searchsorted(self._keys, columns * self._ny + self._cell_y(north), side='right')
+        return np.concatenate([self._order[a:b] for a, b in zip(lo, hi)])
+
+    def _bbox_index(self, west, south, east, north):
+        idx = self._candidates(west, south, east, north)
+        x, y = self._x[idx], self._y[idx]
+        return np.sort(idx[(x >= west) & (x <= east) & (y >= south) & (y <= north)])
+
+    def _within_index(self, geom):
+        rings = _polygon_rings(geom)
+        coords = np.concatenate([np.asarray(ring, dtype=np.float64)[:, :2] for ring in rings])
+        west, south = coords.min(axis=0)
+        east, north = coords.max(axis=0)
+
+        idx = self._bbox_index(west, south, east, north)
+        return idx[_contains(rings, self._x[idx], self._y[idx])]
+
+    def __len__(self):
+        return len(self.results)
+
+    def nearest(self, longitude, latitude):
+        """Return the result of the pixel center nearest to the given spatial location.
+
+        Args:
+            longitude (int/float): A longitude value according to EPSG:4326.
+            latitude (int/float): A latitude value according to EPSG:4326.
+
+        Raises:
+            ValueError: If the region has no results or the location is not finite.
+        """
+        if len(self.results) == 0:
+            raise ValueError('The region has no results.')
+        if not (np.isfinite(longitude) and np.isfinite(latitude)):
+            raise ValueError(f'Location ({latitude}, {longitude}) must be finite.')
+
+        # Grow the searched box until a pixel is found. The nearest pixel is then
+        # no farther than the closest one found, so a box of that half-width
+        # holds it.
+        radius = self._cell
+        while True:
+            idx = self._candidates(longitude - radius, latitude - radius, longitude + radius, latitude + radius)
+            if len(idx) > 0:
+                break
+            radius *= 2
+
+        radius = np.min(np.hypot(self._x[idx] - longitude, self._y[idx] - latitude))
+        idx = self._candidates(longitude - radius, latitude - radius, longitude + radius, latitude + radius)
+
+        distance = np.hypot(self._x[idx] - longitude, self._y[idx] - latitude)
+        return self.results[idx[np.argmin(distance)]]
+
+    def bbox(self, west, south, east, north):
+        """Return the results of the pixel centers within the given bounding box, according to EPSG:4326.
+
+        The bounds may be infinite.
+
+        Returns:
+        list: A list of dictionaries, in the order of the region results.
+
+
+        Raises:
+            ValueError: If a bound is NaN.
+        """
+        if np.isnan([west, south, east, north]).any():
+            raise ValueError('The bounding box must not have NaN bounds.')
+        return [self.results[i] for i in self._bbox_index(west, south, east, north)]
+
+    def within(self, geom):
+        """Return the results of the pixel centers within the given polygon.
+
+        Args:
+            geom: GeoJSON (or an object with ``__geo_interface__``) of a Polygon or MultiPolygon, according to EPSG:4326.
+
+        Returns:
+        list: A list of dictionaries, in the order of the region results.
+        """
+        return [self.results[i] for i in self._within_index(geom)]
+
+    def zonal_stats(self, gdf, metrics=None, stats=('mean', 'median'), id_column=None):
+        """Summarize the phenological metrics of the pixel centers within each feature of a GeoDataFrame.
+
+        Args:
+            gdf: GeoDataFrame (or GeoSeries) with Polygon or MultiPolygon geometries, according to EPSG:4326.
+            metrics (list, optional): The phenological metrics to summarize, e.g. ``['sos_t', 'pos_v']``. All of them when not given.
+            stats (list): The pandas aggregations to compute, e.g. ``mean``, ``median``, ``min``, ``max``, ``std``, ``count``.
+            id_column (str, optional): Column holding the feature id. The GeoDataFrame index is used when not given.
+
+        Returns:
+        pandas.DataFrame: One row per feature id with a (metric, stat) column for each combination, and the ``pixels`` count.
+        """
+        if metrics is None:
+            metrics = [name for name in self.data.columns if name not in ('longitude', 'latitude')]
+
+        ids = _feature_ids(gdf, id_column)
+        index = [
+            self._within_index(geom) if geom is not None else np.empty(0, dtype=np.int64)
+            for geom in _geometries(gdf)
+        ]
+        rows = np.concatenate(index) if index else np.empty(0, dtype=np.int64)
+        feature = np.repeat(np.arange(len(index)), [len(idx) for idx in index])
+
+        grouped = self.data.iloc[rows][list(metrics)].groupby(feature)
+        if len(metrics) > 0:
+            table = grouped.agg(list(stats))
+        else:
+            table = pd.DataFrame(index=grouped.size().index)
+        table['pixels'] = grouped.size()
+
+        table = table.reindex(range(len(ids)))
+        table['pixels'] = table['pixels'].fillna(0).astype(int)
+        table.index = pd.Index(ids, name=id_column)
+        return table
+
+class DaskExecutor:
+    """Run the tasks of the batch and region functions on a Dask cluster.
+
+    It exposes the ``map`` method of ``concurrent.futures.Executor``, so it can be
+    given as the ``executor`` of ``get_timeseries_features``, ``get_phenometrics_features``
+    and ``get_phenometrics_tiles``. Dask is an optional dependency, installed with
+    ``pip install wcpms[dask]``.
+
+    Args:
+        client (distributed.Client): Client connected to the Dask scheduler.
+
+    Example:
+
+        .. code-block:: python
+
+            from dask.distributed import Client, LocalCluster
+
+            with LocalCluster(n_workers=4) as cluster, Client(cluster) as client:
+                pm = get_phenometrics_tiles(wcpms_url, datacube, geom, executor=DaskExecutor(client))
+    """
+
+    def __init__(self, client):
+        #: distributed.Client: Client connected to the Dask scheduler.
+        self.client = client
+
+    def map(self, func, *iterables):
+        """Run func for each item of the iterables on the cluster, returning the results in order.
+
+        The first error is raised as soon as it happens, cancelling the remaining tasks.
+        """
+        futures = self.client.map(func, *iterables, pure=False)
+        try:
+            return self.client.gather(futures)
+        except BaseException:
+            self.client.cancel(futures)
+            raise
+
+def _polygonal(geom):
+    # The intersection of a region and a tile may also hold the lines and points
+    # where they only touch, which are dropped.
+    polygons = [part for part in shapely.get_parts(geom) if part.geom_type == 'Polygon' and part.area > 0]
+    if not polygons:
+        return None
+    return polygons[0] if len(polygons) == 1 else shapely.MultiPolygon(polygons)
+
+def _tile_count(extent, tile_size):
+    # Rounded first, so that float noise (e.g. 0.3 / 0.1) does not add a sliver tile.
+    return int(np.ceil(round(extent / tile_size, 9)))
+
+def _tiles(geom, tile_size):
+    region = shape(geom if isinstance(geom, dict) else geom.__geo_interface__)
+    if region.geom_type not in ('Polygon', 'MultiPolygon'):
+        raise ValueError(f'Geometry type {region.geom_type} is not supported, expected Polygon or MultiPolygon.')
+    west, south, east, north = region.bounds
+
+    nx, ny = _tile_count(east - west, tile_size), _tile_count(north - south, tile_size)
+    xs = west + tile_size * np.arange(nx + 1)
+    ys = south + tile_size * np.arange(ny + 1)
+    xs[-1], ys[-1] = east, north
+
+    # The region is clipped to each column, then each column to its tiles, so
+    # that tiles outside of the region are never requested and each request
+    # only covers the part of the region within its tile.
+    tiles = []
+    for i in range(nx):
+        column = _polygonal(region.intersection(shapely.box(xs[i], south, xs[i + 1], north)))
+        if column is None:
+            continue
+        for j in range(ny):
+            tile = _polygonal(column.intersection(shapely.box(xs[i], ys[j], xs[i + 1], ys[j + 1])))
+            if tile is not None:
+                bounds = (float(xs[i]), float(ys[j]), float(xs[i + 1]), float(ys[j + 1]))
+                tiles.append((mapping(tile), bounds, i == nx - 1, j == ny - 1))
+    return tiles
+
+def _tile_phenometrics(url, cube, batch_size, tile):
+    geom, (west, south, east, north), last_x, last_y = tile
+    timeseries = get_timeseries_region(url=url, cube=cube, geom=geom)
+
+    points = np.array([ts['point'] for ts in timeseries], dtype=np.float64).reshape(-1, 2)
+    x, y = points[:, 0], points[:, 1]
+
+    # Tiles are half-open, except on the region edge, so that a pixel center on a
+    # shared border, returned for both tiles, is kept once. Which pixels are within
+    # the region is left to the service, as in get_timeseries_region.
+    keep = (x >= west) & ((x <= east) if last_x else (x < east))
+    keep &= (y >= south) & ((y <= north) if last_y else (y < north))
+
+    timeseries = [ts for ts, k in zip(timeseries, keep) if k]
+    phenometrics = _get_phenometrics_batches(url, cube, timeseries, batch_size)
+
+    points = np.array([pm['point'] for pm in phenometrics], dtype=np.float64).reshape(-1, 2)
+    return _phenometrics_frame(phenometrics, points[:, 0], points[:, 1])
+
+def get_phenometrics_tiles(url, cube, geom, tile_size=0.1, batch_size=BATCH_SIZE, executor=None, max_workers=4):
+    """Calculates the phenological metrics of a large region, partitioned in spatial tiles running in parallel.
+
+    The region is clipped to each tile and only the tiles that intersect it are
+    requested. Each tile retrieves its time series, calculates its phenological
+    metrics and returns them as a ``pandas.DataFrame``, so only columnar partitions
+    are sent back from the workers of a process pool or a Dask cluster.
+
+    Args:
+        url: The url of the available wcpms service running.
+
+        cube : Dictionary with information about a BDC's data cubes with collection, start_date, end_date, freq and band.
+
+        geom : GeoJSON (or an object with ``__geo_interface__``) of a Polygon or MultiPolygon, according to EPSG:4326.
+
+        tile_size : (int/float) The width and height of each tile, in degrees.
+
+        batch_size : (int) Maximum number of time series sent in each request to the service.
+
+        executor : (optional) Executor running the tiles instead of a thread pool of max_workers, e.g. a ``concurrent.futures.ProcessPoolExecutor`` or a ``DaskExecutor``.
+
+        max_workers : (int) Maximum number of tiles requested at the same time, when no executor is given.
+
+    Returns:
+    pandas.DataFrame: One row per pixel center with its longitude, latitude and phenological metrics.
+
+
+    Raises:
+        ConnectionError: If the server is not reachable.
+        HTTPError: If the server response indicates an error.
+        ValueError: If the response body is not a json document or the geometry is not a Polygon or MultiPolygon.
+    """
+    task = partial(_tile_phenometrics, url, cube, batch_size)
+    tiles = _tiles(geom, tile_size)
+    if not tiles:
+        return _phenometrics_frame([], [], [])
+
+    return pd.concat(_map(task, tiles, max_workers, executor), ignore_index=True)